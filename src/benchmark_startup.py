@@ -0,0 +1,113 @@
+import functools
+import subprocess
+import sys
+import time
+
+from schemas.flow import Flow
+
+ACTIONS_PER_CHAIN = 10
+FLOW_SIZES = (10, 1_000, 10_000)
+IMPORTED_MODULES = ("schemas.flow", "chain_executor")
+
+
+def generate_action(index: int) -> dict:
+    match index % 4:
+
+        case 0:
+            return {
+                "type": "screenshot",
+                "element_selector": [
+                    {
+                        "type": "complex",
+                        "locator_selector": {"type": "locator", "expression": "header"},
+                        "text_selector": {"type": "text", "text": f"Item {index}"},
+                    }
+                ],
+                "filename": f"/benchmark/{index}.png",
+            }
+
+        case 1:
+            return {
+                "type": "click",
+                "element_selector": [{"type": "text", "text": f"Item {index}"}],
+            }
+
+        case 2:
+            return {
+                "type": "fill",
+                "element_selector": [{"type": "locator", "expression": "input"}],
+                "action_kwargs": {"value": f"Value {index}"},
+            }
+
+        case _:
+            return {
+                "type": "drag_to",
+                "element_selector": [
+                    {"type": "role", "role": "button", "name": f"Item {index}"},
+                    {"type": "locator", "expression": "main"},
+                ],
+            }
+
+
+def generate_flow_dict(actions_count: int) -> dict:
+    return {
+        "chains": [
+            {
+                "name": f"Chain {start}",
+                "url": "/",
+                "actions": [
+                    generate_action(index)
+                    for index in range(
+                        start, min(start + ACTIONS_PER_CHAIN, actions_count)
+                    )
+                ],
+            }
+            for start in range(0, actions_count, ACTIONS_PER_CHAIN)
+        ]
+    }
+
+
+def measure(function, repeats: int = 3) -> float:
+    timings = []
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started_at)
+
+    return min(timings)
+
+
+def measure_import(module: str) -> float:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import time; started_at = time.perf_counter(); "
+            f"import {module}; print(time.perf_counter() - started_at)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(output.stdout)
+
+
+def main() -> None:
+    for module in IMPORTED_MODULES:
+        print(f"import {module:<28} {measure_import(module) * 1000:10.1f} ms")
+
+    print()
+    print(f"{'actions':>8} {'validate':>12} {'per action':>12}")
+    for actions_count in FLOW_SIZES:
+        flow_dict = generate_flow_dict(actions_count)
+        validation_time = measure(functools.partial(Flow.model_validate, flow_dict))
+
+        print(
+            f"{actions_count:>8} "
+            f"{validation_time * 1000:>9.1f} ms "
+            f"{validation_time / actions_count * 1_000_000:>9.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
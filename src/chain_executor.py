@@ -1,34 +1,64 @@
 import os
 import random
-from typing import Optional
+import time
+from typing import Any, Optional
 
 from playwright.async_api import Frame, FrameLocator, Locator, Page
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright, expect
 
+from failure_artifacts import FailureRecorder
+from metrics import metrics
+from output_backends import LocalOutputBackend, OutputBackend
 from schemas.config import Config
 from schemas.flow import Action, ActionType, Chain, ScreenshotAction
 from schemas.selectors import (
+    AnyElementSelector,
     ComplexElementSelector,
-    LocatorElementSelector,
     MatchMode,
     SelectorType,
     TextElementSelector,
 )
+from selector_profiler import SelectorProfiler
+
+STABILIZATION_CSS = """
+*, *::before, *::after {
+    animation-delay: 0s !important;
+    animation-duration: 0s !important;
+    animation-iteration-count: 1 !important;
+    transition-delay: 0s !important;
+    transition-duration: 0s !important;
+    caret-color: transparent !important;
+    scroll-behavior: auto !important;
+}
+"""
 
 
 class ChainExecutor:
 
-    def __init__(self, config: Config, chain_name: str = "N/D") -> None:
+    def __init__(
+        self,
+        config: Config,
+        chain_name: str = "N/D",
+        profiler: Optional[SelectorProfiler] = None,
+        output_backend: Optional[OutputBackend] = None,
+    ) -> None:
         self.browser = None
         self.context = None
         self.page = None
-        self.output_dir = config.base_output_dir
         self.base_url = config.base_url
         self.auth_config = config.auth_config
         self.running_chain = chain_name
-
-        os.makedirs(self.output_dir, exist_ok=True)
+        self.profiler = profiler
+        self.failure_recorder = (
+            FailureRecorder(config.failure_artifacts_config, chain_name)
+            if config.failure_artifacts_config
+            else None
+        )
+        self.owns_output_backend = output_backend is None
+        self.output_backend = output_backend or LocalOutputBackend(
+            config.base_output_dir
+        )
 
     async def initialize(self, additional_context_params: dict = None) -> None:
         print(f"{self.running_chain} | Initializing browser.")
@@ -45,9 +75,14 @@ class ChainExecutor:
 
         playwright = await async_playwright().start()
         self.browser = await playwright.chromium.launch(headless=False)
+        metrics.active_browsers.inc()
         self.context = await self.browser.new_context(**context_params)
+        metrics.active_contexts.inc()
         self.page = await self.context.new_page()
 
+        if self.failure_recorder:
+            await self.failure_recorder.attach(self.context)
+
     async def authenticate(self) -> None:
         print(f"{self.running_chain} | Authenticating.")
 
@@ -73,7 +108,9 @@ class ChainExecutor:
         print(f"{self.running_chain} | Authenticating with cache.")
         try:
             await self.page.wait_for_url("**/organization")
+            metrics.auth_attempts.inc(method="cache", result="succeeded")
         except PlaywrightTimeoutError:
+            metrics.auth_attempts.inc(method="cache", result="failed")
             print(
                 f"{self.running_chain} | Can't authenticate with existing cache. Overriding it."
             )
@@ -101,7 +138,12 @@ class ChainExecutor:
         await self.page.click(self.auth_config.submit_selector)
 
         await self.page.wait_for_load_state()
-        await self.page.wait_for_url("**/organization/**")
+        try:
+            await self.page.wait_for_url("**/organization/**")
+        except PlaywrightTimeoutError:
+            metrics.auth_attempts.inc(method="credentials", result="failed")
+            raise
+        metrics.auth_attempts.inc(method="credentials", result="succeeded")
 
         await self.page.context.storage_state(path=self.auth_config.storage_state_path)
 
@@ -119,8 +161,44 @@ class ChainExecutor:
 
     async def find_element(
         self,
-        selector: TextElementSelector | LocatorElementSelector | ComplexElementSelector,
+        selector: AnyElementSelector,
     ) -> Optional[Locator]:
+        element = await self._locate_element(selector)
+
+        started_at = time.monotonic()
+        try:
+            await self._verify_found_element(element)
+        except Exception:
+            await self._record_selector_resolution(selector, element, started_at, False)
+            raise
+
+        await self._record_selector_resolution(selector, element, started_at, True)
+        return element
+
+    async def _record_selector_resolution(
+        self,
+        selector: AnyElementSelector,
+        element: Locator,
+        started_at: float,
+        found: bool,
+    ) -> None:
+        resolution_time = time.monotonic() - started_at
+        metrics.selector_wait_seconds.observe(resolution_time, type=selector.type)
+
+        if self.profiler:
+            await self.profiler.record(
+                self.page,
+                selector,
+                element,
+                resolution_time,
+                found,
+                self.running_chain,
+            )
+
+    async def _locate_element(
+        self,
+        selector: AnyElementSelector,
+    ) -> Locator:
         match selector.type:
 
             case SelectorType.text:
@@ -132,10 +210,17 @@ class ChainExecutor:
             case SelectorType.complex:
                 element = await self._find_element_by_complex_selector(selector)
 
+            case SelectorType.role:
+                element = self.page.get_by_role(
+                    selector.role,
+                    name=selector.name,
+                    exact=selector.match == MatchMode.exact,
+                )
+
             case _:
                 raise ValueError("Invalid selector type.")
 
-        return await self._verify_found_element(element)
+        return element
 
     async def _find_by_text(
         self,
@@ -184,42 +269,88 @@ class ChainExecutor:
         await self.page.goto(self.base_url + chain.url)
         await self.page.wait_for_load_state()
 
+        if self.failure_recorder:
+            self.failure_recorder.running_chain = chain.name
+
         for action in chain.actions:
+            started_at = time.monotonic()
             try:
+                if self.failure_recorder:
+                    await self.failure_recorder.start_action(action)
                 await self.handle_action(action)
             except Exception as e:
-                raise type(e)(str(e) + f"| Action note: {action.note}. |")
+                metrics.actions_failed.inc(type=action.type)
+                if isinstance(e, (TimeoutError, PlaywrightTimeoutError)):
+                    metrics.action_timeouts.inc(type=action.type)
+                message = str(e) + f"| Action note: {action.note}. |"
+                if self.failure_recorder:
+                    try:
+                        artifacts_dir = await self.failure_recorder.dump(self.page, e)
+                        message += f" Failure artifacts: {artifacts_dir}. |"
+                    except Exception as dump_error:
+                        print(
+                            f"{self.running_chain} | "
+                            f"Can't dump failure artifacts: {dump_error}"
+                        )
+                raise type(e)(message)
+            finally:
+                metrics.action_duration_seconds.observe(
+                    max(
+                        0,
+                        time.monotonic() - started_at - action.post_action_timeout,
+                    ),
+                    type=action.type,
+                )
+            if self.failure_recorder:
+                await self.failure_recorder.finish_action()
+            metrics.actions_executed.inc(type=action.type)
 
     async def handle_action(self, action: Action | ScreenshotAction) -> None:
         if action.type == ActionType.screenshot:
-            if not isinstance(action, ScreenshotAction):
-                raise TypeError(
-                    "Action with 'type = screenshot' "
-                    "must be instance of 'ScreenshotAction'"
-                )
+            screenshot_kwargs = dict(action.action_kwargs)
 
-            action.action_kwargs["path"] = self.output_dir + action.filename
+            if action.stabilize:
+                await self._stabilize_page()
+                screenshot_kwargs.setdefault("animations", "disabled")
+                screenshot_kwargs.setdefault("caret", "hide")
+                screenshot_kwargs.setdefault("style", STABILIZATION_CSS)
+
+            if action.mask_selectors:
+                screenshot_kwargs["mask"] = [
+                    await self._locate_element(selector)
+                    for selector in action.mask_selectors
+                ]
 
             if action.element_selector:
                 element = await self.find_element(action.element_selector[0])
 
                 box = await element.bounding_box()
-                action.action_kwargs["clip"] = {
+                screenshot_kwargs["clip"] = {
                     "x": max(0, box["x"] - action.padding),
                     "y": max(0, box["y"] - action.padding),
                     "width": box["width"] + 2 * action.padding,
                     "height": box["height"] + 2 * action.padding,
                 }
             else:
-                action.action_kwargs["full_page"] = True
+                screenshot_kwargs["full_page"] = True
 
-            await self._execute_action(
-                "screenshot",
-                action.action_kwargs,
-                self.page,
-                new_page_handling_required=action.new_page_handling_required,
-                new_page_handling_timeout=action.new_page_handling_timeout,
-            )
+            if action.stable_captures > 1:
+                screenshot = await self._take_stable_screenshot(
+                    screenshot_kwargs,
+                    action.stable_captures,
+                    action.stabilization_timeout,
+                )
+            else:
+                screenshot = await self._execute_action(
+                    "screenshot",
+                    screenshot_kwargs,
+                    self.page,
+                    new_page_handling_required=action.new_page_handling_required,
+                    new_page_handling_timeout=action.new_page_handling_timeout,
+                )
+
+            await self.output_backend.write(action.filename, screenshot)
+            metrics.screenshots_written.inc()
 
         elif action.type in ActionType:
             if len(action.element_selector) == 1:
@@ -253,6 +384,32 @@ class ChainExecutor:
         if timeout := action.post_action_timeout:
             await self.page.wait_for_timeout(timeout * 1000)
 
+    async def _stabilize_page(self) -> None:
+        print(f"{self.running_chain} | Stabilizing page before screenshot.")
+
+        await self.page.evaluate("document.fonts.ready.then(() => true)")
+
+    async def _take_stable_screenshot(
+        self, screenshot_args: dict, required_captures: int, timeout: float
+    ) -> bytes:
+        print(f"{self.running_chain} | Executing stable screenshot.")
+
+        deadline = time.monotonic() + timeout
+        previous_capture = await self.page.screenshot(**screenshot_args)
+        matching_captures = 1
+
+        while matching_captures < required_captures:
+            if time.monotonic() > deadline:
+                raise TimeoutError("Screenshot was not stabilized before timeout.")
+
+            capture = await self.page.screenshot(**screenshot_args)
+            matching_captures = (
+                matching_captures + 1 if capture == previous_capture else 1
+            )
+            previous_capture = capture
+
+        return previous_capture
+
     async def _execute_action(
         self,
         action: str,
@@ -261,7 +418,7 @@ class ChainExecutor:
         element_to_pass_into_action: Page | Frame | FrameLocator | Locator = None,
         new_page_handling_required: bool = False,
         new_page_handling_timeout: float = 10,
-    ) -> None:
+    ) -> Any:
         print(f"{self.running_chain} | Executing {action}.")
 
         method = getattr(element_to_call_action_on, action)
@@ -272,9 +429,11 @@ class ChainExecutor:
                     timeout=(new_page_handling_timeout * 1000)
                 ) as new_page_info:
                     if element_to_pass_into_action:
-                        await method(element_to_pass_into_action, **action_args)
+                        result = await method(
+                            element_to_pass_into_action, **action_args
+                        )
                     else:
-                        await method(**action_args)
+                        result = await method(**action_args)
 
                 print(f"{self.running_chain} | Switching to the new page.")
                 self.page = await new_page_info.value
@@ -282,13 +441,21 @@ class ChainExecutor:
                 raise TimeoutError("No new page was opened before timeout.")
         else:
             if element_to_pass_into_action:
-                await method(element_to_pass_into_action, **action_args)
+                result = await method(element_to_pass_into_action, **action_args)
             else:
-                await method(**action_args)
+                result = await method(**action_args)
+
+        return result
 
     async def cleanup(self) -> None:
         if self.browser:
             await self.browser.close()
+            metrics.active_contexts.dec()
+            metrics.active_browsers.dec()
+            self.browser = None
+
+        if self.owns_output_backend:
+            await self.output_backend.close()
 
         if self.running_chain:
             self.running_chain = "N/D"
@@ -0,0 +1,143 @@
+import asyncio
+import math
+import os
+from typing import Awaitable, Callable, Iterable, Optional
+
+from metrics import metrics
+from schemas.config import ConcurrencyConfig
+
+
+class ConcurrencyController:
+
+    def __init__(self, config: ConcurrencyConfig) -> None:
+        self.config = config
+        self.limit = config.initial_workers
+        self.active = 0
+        self.condition: Optional[asyncio.Condition] = None
+        self.last_durations = (0.0, 0)
+        self.last_outcomes = (0, 0)
+        self.decrease_pending = False
+
+    async def run(
+        self, items: Iterable, worker: Callable[..., Awaitable[None]]
+    ) -> None:
+        self.condition = asyncio.Condition()
+        metrics.concurrency_limit.set(self.limit)
+        adjusting_task = asyncio.create_task(self._adjust_periodically())
+
+        async def run_worker(item) -> None:
+            try:
+                await worker(item)
+            finally:
+                async with self.condition:
+                    self.active -= 1
+                    self.condition.notify_all()
+
+        tasks = []
+        try:
+            for item in items:
+                async with self.condition:
+                    await self.condition.wait_for(lambda: self.active < self.limit)
+                    self.active += 1
+                tasks.append(asyncio.create_task(run_worker(item)))
+
+            await asyncio.gather(*tasks)
+        finally:
+            adjusting_task.cancel()
+            try:
+                await adjusting_task
+            except asyncio.CancelledError:
+                pass
+
+    async def _adjust_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.adjustment_interval)
+            await self.adjust()
+
+    async def adjust(self) -> None:
+        congestion_reasons = self._find_congestion_reasons()
+        old_limit = self.limit
+
+        # Decreasing the limit doesn't stop running chains, so measurements
+        # reflect the old concurrency until active chains fit into the limit,
+        # and for one more window that was partially run above it.
+        if self.decrease_pending:
+            if self.active <= self.limit:
+                self.decrease_pending = False
+            return
+
+        if congestion_reasons:
+            self.limit = max(
+                self.config.min_workers,
+                math.floor(self.limit * self.config.decrease_factor),
+            )
+            decision = "decreasing" if self.limit < old_limit else "holding at minimum"
+            self.decrease_pending = self.limit < old_limit
+            reason = ", ".join(congestion_reasons)
+        elif self.active >= self.limit and metrics.queue_depth.total() > 0:
+            self.limit = min(self.config.max_workers, self.limit + 1)
+            decision = "increasing" if self.limit > old_limit else "holding at maximum"
+            reason = "no congestion, all workers are busy"
+        else:
+            return
+
+        print(
+            f"Concurrency | {decision} workers limit: {old_limit} -> {self.limit} "
+            f"({reason})."
+        )
+        metrics.concurrency_limit.set(self.limit)
+
+        async with self.condition:
+            self.condition.notify_all()
+
+    def _find_congestion_reasons(self) -> list[str]:
+        reasons = []
+
+        total_duration = metrics.action_duration_seconds.total()
+        total_count = sum(metrics.action_duration_seconds.counts.values())
+        last_duration, last_count = self.last_durations
+        self.last_durations = (total_duration, total_count)
+        if total_count > last_count:
+            latency = (total_duration - last_duration) / (total_count - last_count)
+            if latency > self.config.target_action_latency:
+                reasons.append(f"action latency {latency:.2f}s")
+
+        timeouts = metrics.action_timeouts.total()
+        actions = metrics.actions_executed.total() + metrics.actions_failed.total()
+        last_timeouts, last_actions = self.last_outcomes
+        self.last_outcomes = (timeouts, actions)
+        if actions > last_actions:
+            timeout_rate = (timeouts - last_timeouts) / (actions - last_actions)
+            if timeout_rate > self.config.max_timeout_rate:
+                reasons.append(f"timeout rate {timeout_rate:.0%}")
+
+        cpu_load = self._get_cpu_load()
+        if cpu_load is not None and cpu_load > self.config.max_cpu_load:
+            reasons.append(f"CPU load {cpu_load:.2f}")
+
+        available_memory = self._get_available_memory()
+        if (
+            available_memory is not None
+            and available_memory < self.config.min_available_memory
+        ):
+            reasons.append(f"available memory {available_memory:.0%}")
+
+        return reasons
+
+    @staticmethod
+    def _get_cpu_load() -> Optional[float]:
+        try:
+            return os.getloadavg()[0] / (os.cpu_count() or 1)
+        except (AttributeError, OSError):
+            return None
+
+    @staticmethod
+    def _get_available_memory() -> Optional[float]:
+        try:
+            with open("/proc/meminfo") as file:
+                meminfo = {
+                    line.split(":")[0]: int(line.split()[1]) for line in file if line
+                }
+            return meminfo["MemAvailable"] / meminfo["MemTotal"]
+        except (OSError, KeyError, ValueError, ZeroDivisionError):
+            return None
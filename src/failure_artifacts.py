@@ -0,0 +1,131 @@
+import json
+import os
+import re
+import tempfile
+import time
+from collections import deque
+
+from playwright.async_api import BrowserContext, ConsoleMessage
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import Page, Request, Response
+
+from schemas.config import FailureArtifactsConfig
+from schemas.flow import Action
+
+
+class FailureRecorder:
+
+    def __init__(self, config: FailureArtifactsConfig, chain_name: str = "N/D") -> None:
+        self.config = config
+        self.running_chain = chain_name
+        self.context = None
+        self.actions: deque = deque(maxlen=config.buffer_size)
+        self.page_events: dict[Page, deque] = {}
+        self.tracing = False
+
+    async def attach(self, context: BrowserContext) -> None:
+        self.context = context
+        for page in context.pages:
+            self._attach_page(page)
+        context.on("page", self._attach_page)
+
+        if self.config.trace:
+            await context.tracing.start(
+                screenshots=self.config.trace_screenshots,
+                snapshots=self.config.trace_snapshots,
+            )
+            self.tracing = True
+
+    def _attach_page(self, page: Page) -> None:
+        if page in self.page_events:
+            return
+
+        events = deque(maxlen=self.config.buffer_size)
+        self.page_events[page] = events
+
+        def on_console(message: ConsoleMessage) -> None:
+            events.append((time.time(), "console", message.type, message.text))
+
+        def on_response(response: Response) -> None:
+            events.append((time.time(), "response", response.status, response.url))
+
+        def on_request_failed(request: Request) -> None:
+            events.append((time.time(), "requestfailed", request.failure, request.url))
+
+        page.on("console", on_console)
+        page.on("response", on_response)
+        page.on("requestfailed", on_request_failed)
+
+    async def start_action(self, action: Action) -> None:
+        self.actions.append((time.time(), action.type, action.note))
+
+        if self.tracing:
+            await self.context.tracing.start_chunk()
+
+    async def finish_action(self) -> None:
+        if self.tracing:
+            await self.context.tracing.stop_chunk()
+
+    async def dump(self, page: Page, error: Exception) -> str:
+        chain_slug = re.sub(r"[^A-Za-z0-9_-]+", "-", self.running_chain).strip("-")
+        os.makedirs(self.config.output_dir, exist_ok=True)
+        # Concurrent chains may share a name, so directory is made unique.
+        artifacts_dir = tempfile.mkdtemp(
+            prefix=f"{time.strftime('%Y%m%d-%H%M%S')}-{chain_slug or 'chain'}-",
+            dir=self.config.output_dir,
+        )
+        print(f"{self.running_chain} | Dumping failure artifacts to {artifacts_dir}.")
+
+        if self.tracing:
+            await self._save_artifact(
+                "trace",
+                self.context.tracing.stop_chunk(
+                    path=os.path.join(artifacts_dir, "trace.zip")
+                ),
+            )
+            self.tracing = False
+
+        await self._save_artifact(
+            "screenshot",
+            page.screenshot(
+                path=os.path.join(artifacts_dir, "screenshot.png"), full_page=True
+            ),
+        )
+
+        content = await self._save_artifact("DOM snapshot", page.content())
+        if content is not None:
+            with open(os.path.join(artifacts_dir, "dom.html"), "w") as file:
+                file.write(content)
+
+        with open(os.path.join(artifacts_dir, "events.json"), "w") as file:
+            json.dump(self._describe(page, error), file, indent=2, default=str)
+
+        return artifacts_dir
+
+    async def _save_artifact(self, name: str, artifact_coroutine):
+        try:
+            return await artifact_coroutine
+        except (PlaywrightError, OSError) as e:
+            print(f"{self.running_chain} | Can't save failure {name}: {e}")
+
+    def _describe(self, page: Page, error: Exception) -> dict:
+        return {
+            "chain": self.running_chain,
+            "error": f"{type(error).__name__}: {error}",
+            "url": page.url,
+            "actions": [
+                {"time": at, "type": action_type, "note": note}
+                for at, action_type, note in self.actions
+            ],
+            "pages": [
+                {
+                    "url": buffered_page.url,
+                    "current": buffered_page is page,
+                    "events": [
+                        {"time": at, "kind": kind, "detail": detail, "value": value}
+                        for at, kind, detail, value in events
+                    ],
+                }
+                for buffered_page, events in self.page_events.items()
+            ],
+        }
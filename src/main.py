@@ -1,7 +1,11 @@
 import asyncio
+import functools
+from typing import Any, Callable
 
-from chain_executor import ChainExecutor
+from concurrency import ConcurrencyController
 from inputs import config_dict, documentation_flow_dict
+from metrics import MetricsReporter, metrics
+from output_backends import create_output_backend
 from schemas.config import Config
 from schemas.flow import Chain, Flow
 
@@ -9,20 +13,67 @@ config = Config.model_validate(config_dict)
 flow = Flow.model_validate(documentation_flow_dict)
 
 
-async def run_chain(chain: Chain):
-    executor = ChainExecutor(config, chain.name)
+async def run_chain(chain: Chain, create_executor: Callable[[str], Any]):
+    metrics.queue_depth.dec()
+    executor = create_executor(chain.name)
     try:
         await executor.authenticate()
         await executor.process_chain(chain)
+        metrics.chains_finished.inc(result="succeeded")
         print(f"{chain.name} | Documentation screenshots completed.")
     except Exception as e:
+        metrics.chains_finished.inc(result="failed")
         print(f"{chain.name} | Error generating screenshots:", e)
     finally:
         await executor.cleanup()
 
 
 async def main():
-    await asyncio.gather(*[run_chain(chain) for chain in flow.chains])
+    # Playwright is imported only here, after config and flow are validated,
+    # so invalid inputs are reported without paying for it.
+    from chain_executor import ChainExecutor
+    from selector_profiler import SelectorProfiler
+
+    output_backend = create_output_backend(
+        config.output_backend_config, config.base_output_dir
+    )
+    profiler = (
+        SelectorProfiler(config.profiler_config) if config.profiler_config else None
+    )
+    run = functools.partial(
+        run_chain,
+        create_executor=functools.partial(
+            ChainExecutor,
+            config,
+            profiler=profiler,
+            output_backend=output_backend,
+        ),
+    )
+
+    metrics.actions_planned.set(flow.count_actions())
+    metrics.queue_depth.set(flow.count_chains())
+
+    reporter = MetricsReporter(config.metrics_config)
+    await reporter.start()
+    await output_backend.start()
+    try:
+        if config.concurrency_config:
+            controller = ConcurrencyController(config.concurrency_config)
+            await controller.run(flow.iter_chains(), run)
+        else:
+            await asyncio.gather(*[run(chain) for chain in flow.iter_chains()])
+    finally:
+        try:
+            await output_backend.close()
+            print("Output | All output files are stored.")
+        except Exception as e:
+            print("Output | Error storing output files:", e)
+
+        await reporter.stop()
+
+        if profiler:
+            profiler.save()
+            profiler.report()
 
 
 asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,281 @@
+import asyncio
+import time
+from typing import Optional
+
+from schemas.config import MetricsConfig
+
+LabelValues = tuple[str, ...]
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labels: tuple = ()) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = labels
+        self.values: dict[LabelValues, float] = {}
+
+    def _key(self, labels: dict) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def _format_labels(self, key: LabelValues, extra: dict = None) -> str:
+        pairs = list(zip(self.label_names, key))
+        if extra:
+            pairs.extend(extra.items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+    def total(self) -> float:
+        return sum(self.values.values())
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for key, value in self.values.items():
+            lines.append(f"{self.name}{self._format_labels(key)} {value}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: tuple = (),
+        buckets: tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ) -> None:
+        super().__init__(name, description, labels)
+        self.buckets = buckets
+        self.bucket_counts: dict[LabelValues, list[int]] = {}
+        self.counts: dict[LabelValues, int] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        counts = self.bucket_counts.setdefault(key, [0] * len(self.buckets))
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+        self.values[key] = self.values.get(key, 0) + value
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for key, value in self.values.items():
+            for bound, count in zip(self.buckets, self.bucket_counts[key]):
+                lines.append(
+                    f"{self.name}_bucket{self._format_labels(key, {'le': bound})} {count}"
+                )
+            lines.append(
+                f"{self.name}_bucket{self._format_labels(key, {'le': '+Inf'})} "
+                f"{self.counts[key]}"
+            )
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {value}")
+            lines.append(
+                f"{self.name}_count{self._format_labels(key)} {self.counts[key]}"
+            )
+        return lines
+
+
+class Metrics:
+
+    def __init__(self) -> None:
+        self.actions_executed = Counter(
+            "screenshots_pipeline_actions_executed_total",
+            "Actions executed by chain executors.",
+            ("type",),
+        )
+        self.actions_failed = Counter(
+            "screenshots_pipeline_actions_failed_total",
+            "Actions failed by chain executors.",
+            ("type",),
+        )
+        self.actions_planned = Gauge(
+            "screenshots_pipeline_actions_planned",
+            "Actions declared in the flow being executed.",
+        )
+        self.action_timeouts = Counter(
+            "screenshots_pipeline_action_timeouts_total",
+            "Actions failed by timeout.",
+            ("type",),
+        )
+        self.action_duration_seconds = Histogram(
+            "screenshots_pipeline_action_duration_seconds",
+            "Time spent executing actions.",
+            ("type",),
+        )
+        self.chains_finished = Counter(
+            "screenshots_pipeline_chains_finished_total",
+            "Chains finished, by result.",
+            ("result",),
+        )
+        self.screenshots_written = Counter(
+            "screenshots_pipeline_screenshots_written_total",
+            "Screenshots passed to the output backend.",
+        )
+        self.bytes_written = Counter(
+            "screenshots_pipeline_bytes_written_total",
+            "Bytes of screenshots passed to the output backend.",
+        )
+        self.selector_wait_seconds = Histogram(
+            "screenshots_pipeline_selector_wait_seconds",
+            "Time spent waiting for selected elements to become visible.",
+            ("type",),
+        )
+        self.auth_attempts = Counter(
+            "screenshots_pipeline_auth_attempts_total",
+            "Authentication attempts, by method and result.",
+            ("method", "result"),
+        )
+        self.active_browsers = Gauge(
+            "screenshots_pipeline_active_browsers",
+            "Browsers currently launched.",
+        )
+        self.active_contexts = Gauge(
+            "screenshots_pipeline_active_contexts",
+            "Browser contexts currently opened.",
+        )
+        self.pending_outputs = Gauge(
+            "screenshots_pipeline_pending_outputs",
+            "Output files waiting to be written by output backend.",
+        )
+        self.concurrency_limit = Gauge(
+            "screenshots_pipeline_concurrency_limit",
+            "Limit of concurrently executed chains.",
+        )
+        self.queue_depth = Gauge(
+            "screenshots_pipeline_queue_depth",
+            "Chains waiting to be started.",
+        )
+        self.started_at = time.monotonic()
+
+    def all(self) -> list[Metric]:
+        return [value for value in vars(self).values() if isinstance(value, Metric)]
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.all():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def progress_line(self) -> str:
+        elapsed = time.monotonic() - self.started_at
+        failed = self.chains_finished.values.get(("failed",), 0)
+        succeeded = self.chains_finished.values.get(("succeeded",), 0)
+        return (
+            f"[{elapsed:7.1f}s] "
+            f"actions {self.actions_executed.total():.0f}/{self.actions_planned.total():.0f} "
+            f"| failed {self.actions_failed.total():.0f} "
+            f"| screenshots {self.screenshots_written.total():.0f} "
+            f"({self.bytes_written.total() / 1_048_576:.1f} MB, "
+            f"{self.pending_outputs.total():.0f} pending) "
+            f"| browsers {self.active_browsers.total():.0f}"
+            f"/{self.concurrency_limit.total() or '-'} "
+            f"| queue {self.queue_depth.total():.0f} "
+            f"| chains {succeeded:.0f} ok / {failed:.0f} failed"
+        )
+
+
+metrics = Metrics()
+
+
+class MetricsReporter:
+
+    def __init__(self, config: Optional[MetricsConfig]) -> None:
+        self.config = config
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.progress_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self.config is None:
+            return
+
+        if self.config.port is not None:
+            self.server = await asyncio.start_server(
+                self._handle_request, self.config.host, self.config.port
+            )
+            print(
+                f"Metrics | Serving metrics at "
+                f"http://{self.config.host}:{self.config.port}/metrics."
+            )
+
+        if self.config.progress_interval:
+            self.progress_task = asyncio.create_task(self._report_progress())
+
+    async def stop(self) -> None:
+        if self.progress_task:
+            self.progress_task.cancel()
+            try:
+                await self.progress_task
+            except asyncio.CancelledError:
+                pass
+            self._print_progress()
+
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def _handle_request(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", metrics.render().encode()
+            else:
+                status, body = "404 Not Found", b"Not found.\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _report_progress(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.progress_interval)
+            self._print_progress()
+
+    @staticmethod
+    def _print_progress() -> None:
+        # Progress is printed on its own lines, like the executors' output,
+        # so concurrent prints from chains do not overwrite it.
+        print(f"Progress | {metrics.progress_line()}", flush=True)
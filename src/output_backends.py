@@ -0,0 +1,201 @@
+import asyncio
+import io
+import os
+import tarfile
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from metrics import metrics
+from schemas.config import (
+    BundleOutputConfig,
+    LocalOutputConfig,
+    OutputBackendType,
+    S3OutputConfig,
+)
+
+
+class OutputBackend(ABC):
+
+    def __init__(
+        self, workers: int = 1, queue_size: int = 64, retries: int = 2
+    ) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retries = retries
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker_tasks: list[asyncio.Task] = []
+        self.errors: list[Exception] = []
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self._open)
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.worker_tasks = [
+            asyncio.create_task(self._work()) for _ in range(self.workers)
+        ]
+
+    async def write(self, key: str, data: bytes) -> None:
+        if self.queue is None:
+            await self.start()
+
+        metrics.bytes_written.inc(len(data))
+        metrics.pending_outputs.inc()
+        await self.queue.put((key.lstrip("/"), data))
+
+    async def close(self) -> None:
+        if self.queue is None:
+            return
+
+        await self.queue.join()
+        for task in self.worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        self.queue = None
+
+        await asyncio.to_thread(self._close)
+
+        if self.errors:
+            print(f"Output | {len(self.errors)} output files were not stored.")
+            raise self.errors[0]
+
+    async def _work(self) -> None:
+        while True:
+            key, data = await self.queue.get()
+            try:
+                await self._store_with_retries(key, data)
+            except Exception as e:
+                print(f"Output | Can't store '{key}': {e}")
+                self.errors.append(e)
+            finally:
+                metrics.pending_outputs.dec()
+                self.queue.task_done()
+
+    async def _store_with_retries(self, key: str, data: bytes) -> None:
+        for attempt in range(self.retries + 1):
+            try:
+                return await asyncio.to_thread(self._store, key, data)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                print(f"Output | Retrying to store '{key}': {e}")
+                await asyncio.sleep(2**attempt)
+
+    def _open(self) -> None:  # noqa: B027
+        pass
+
+    @abstractmethod
+    def _store(self, key: str, data: bytes) -> None:
+        pass
+
+    def _close(self) -> None:  # noqa: B027
+        pass
+
+
+class LocalOutputBackend(OutputBackend):
+
+    def __init__(
+        self, base_dir: str, workers: int = 4, queue_size: int = 64, retries: int = 2
+    ) -> None:
+        super().__init__(workers, queue_size, retries)
+        self.base_dir = base_dir
+
+    def _open(self) -> None:
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def _store(self, key: str, data: bytes) -> None:
+        path = os.path.join(self.base_dir, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(data)
+
+
+class S3OutputBackend(OutputBackend):
+
+    def __init__(self, config: S3OutputConfig) -> None:
+        super().__init__(config.workers, config.queue_size, config.retries)
+        self.config = config
+        self.client = None
+        self.transfer_config = None
+
+    def _open(self) -> None:
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config as BotocoreConfig
+        except ImportError:
+            raise ImportError(
+                "'boto3' is required for S3 output backend. "
+                "Install it with 'poetry install --extras s3'."
+            )
+
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=self.config.endpoint_url,
+            region_name=self.config.region,
+            aws_access_key_id=self.config.access_key_id,
+            aws_secret_access_key=self.config.secret_access_key,
+            config=BotocoreConfig(max_pool_connections=self.config.workers),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=self.config.multipart_threshold,
+            multipart_chunksize=self.config.multipart_chunksize,
+            use_threads=False,
+        )
+
+    def _store(self, key: str, data: bytes) -> None:
+        self.client.upload_fileobj(
+            io.BytesIO(data),
+            self.config.bucket,
+            self.config.prefix + key,
+            ExtraArgs={"ContentType": "image/png"} if key.endswith(".png") else None,
+            Config=self.transfer_config,
+        )
+
+
+class BundleOutputBackend(OutputBackend):
+
+    def __init__(self, config: BundleOutputConfig) -> None:
+        super().__init__(workers=1, queue_size=config.queue_size, retries=0)
+        self.config = config
+        self.bundle = None
+
+    def _open(self) -> None:
+        os.makedirs(os.path.dirname(self.config.path) or ".", exist_ok=True)
+        self.bundle = tarfile.open(
+            self.config.path, "w:gz" if self.config.compress else "w"
+        )
+
+    def _store(self, key: str, data: bytes) -> None:
+        info = tarfile.TarInfo(os.path.join(self.config.root_dir, key))
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self.bundle.addfile(info, io.BytesIO(data))
+
+    def _close(self) -> None:
+        if self.bundle:
+            self.bundle.close()
+            self.bundle = None
+
+
+def create_output_backend(
+    config: Optional[LocalOutputConfig | S3OutputConfig | BundleOutputConfig],
+    base_output_dir: str,
+) -> OutputBackend:
+    if config is None:
+        return LocalOutputBackend(base_output_dir)
+
+    match config.type:
+
+        case OutputBackendType.local:
+            return LocalOutputBackend(
+                base_output_dir, config.workers, config.queue_size, config.retries
+            )
+
+        case OutputBackendType.s3:
+            return S3OutputBackend(config)
+
+        case OutputBackendType.bundle:
+            return BundleOutputBackend(config)
+
+        case _:
+            raise ValueError("Invalid output backend type.")
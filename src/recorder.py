@@ -0,0 +1,473 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+from typing import Optional
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import Page
+
+from chain_executor import ChainExecutor
+from inputs import config_dict
+from schemas.config import Config
+from schemas.flow import Action, ActionType, AnyAction, Chain, ScreenshotAction
+from schemas.selectors import AnyElementSelector, LocatorElementSelector, SelectorType
+from selector_profiler import CANDIDATES_SCRIPT, SelectorProfiler
+
+TARGET_ATTRIBUTE = "data-screenshots-pipeline-target"
+
+RECORDER_SCRIPT = (
+    """
+(() => {
+    if (window.__screenshotsPipelineRecorderInstalled) {
+        return;
+    }
+    window.__screenshotsPipelineRecorderInstalled = true;
+
+    const TARGET_ATTRIBUTE = """
+    + json.dumps(TARGET_ATTRIBUTE)
+    + """;
+    const collectCandidates = """
+    + CANDIDATES_SCRIPT
+    + """;
+    const INTERACTIVE_ELEMENTS = "button, a, input, select, textarea, label, [role], [data-testid]";
+    let hoveredElement = null;
+    let targetsCount = 0;
+
+    function getXPath(element) {
+        const steps = [];
+        for (let node = element; node && node.nodeType === Node.ELEMENT_NODE; node = node.parentElement) {
+            const siblings = node.parentElement
+                ? Array.from(node.parentElement.children).filter(child => child.tagName === node.tagName)
+                : [node];
+            const tag = node.tagName.toLowerCase();
+            steps.unshift(siblings.length > 1 ? `${tag}[${siblings.indexOf(node) + 1}]` : tag);
+        }
+        return "xpath=/" + steps.join("/");
+    }
+
+    function isUniqueLocator(candidate) {
+        try {
+            return candidate.type === "locator"
+                && document.querySelectorAll(candidate.expression).length === 1;
+        } catch (error) {
+            return false;
+        }
+    }
+
+    function describe(element, interactive = true) {
+        const target = (interactive && element.closest(INTERACTIVE_ELEMENTS)) || element;
+        const targetId = String(++targetsCount);
+        // Candidates are collected at event time, as clicks often navigate away
+        // or re-render target before it can be inspected from Python.
+        const candidates = collectCandidates(target).filter(isUniqueLocator);
+        target.setAttribute(TARGET_ATTRIBUTE, targetId);
+        return {target: targetId, candidates: candidates, fallback: getXPath(target)};
+    }
+
+    function record(payload) {
+        window.__screenshotsPipelineRecord({...payload, time: Date.now()}).finally(() => {
+            if (payload.target) {
+                document.querySelector(`[${TARGET_ATTRIBUTE}="${payload.target}"]`)
+                    ?.removeAttribute(TARGET_ATTRIBUTE);
+            }
+        });
+    }
+
+    document.addEventListener("mouseover", event => {
+        hoveredElement = event.target;
+    }, true);
+
+    document.addEventListener("click", event => {
+        if (event.detail <= 1) {
+            record({type: "click", ...describe(event.target)});
+        }
+    }, true);
+
+    document.addEventListener("dblclick", event => {
+        record({type: "dblclick", ...describe(event.target)});
+    }, true);
+
+    document.addEventListener("change", event => {
+        const target = event.target;
+        const tag = target.tagName.toLowerCase();
+        if (tag === "select") {
+            record({type: "select_option", ...describe(target), value: target.value});
+        } else if (["checkbox", "radio"].includes(target.type)) {
+            if (target.checked) {
+                record({type: "check", ...describe(target)});
+            }
+        } else if (target.type !== "file" && ["input", "textarea"].includes(tag)) {
+            record({type: "fill", ...describe(target), value: target.value});
+        }
+    }, true);
+
+    document.addEventListener("keydown", event => {
+        if (!event.altKey || !event.shiftKey) {
+            return;
+        }
+        if (event.code === "KeyS" && hoveredElement) {
+            record({type: "screenshot", ...describe(hoveredElement, false)});
+        } else if (event.code === "KeyP") {
+            record({type: "screenshot", target: null, candidates: [], fallback: null});
+        } else if (event.code === "KeyQ") {
+            record({type: "stop"});
+        } else {
+            return;
+        }
+        event.preventDefault();
+    }, true);
+})();
+"""
+)
+
+REDUNDANT_BEFORE = {
+    ActionType.hover: {
+        ActionType.click,
+        ActionType.dblclick,
+        ActionType.drag_to,
+    },
+    ActionType.focus: {
+        ActionType.click,
+        ActionType.fill,
+        ActionType.select_option,
+        ActionType.set_input_files,
+    },
+    ActionType.click: {
+        ActionType.dblclick,
+        ActionType.fill,
+        ActionType.check,
+        ActionType.select_option,
+    },
+    ActionType.fill: {ActionType.fill},
+    ActionType.select_option: {ActionType.select_option},
+}
+
+
+def optimize_actions(actions: list[AnyAction]) -> list[AnyAction]:
+    optimized = []
+
+    for action in actions:
+        previous = optimized[-1] if optimized else None
+        if (
+            previous is not None
+            and action.type in REDUNDANT_BEFORE.get(previous.type, set())
+            and previous.element_selector[:1] == action.element_selector[:1]
+        ):
+            optimized[-1] = action.model_copy(
+                update={
+                    "post_action_timeout": max(
+                        previous.post_action_timeout, action.post_action_timeout
+                    ),
+                    "new_page_handling_required": previous.new_page_handling_required
+                    or action.new_page_handling_required,
+                }
+            )
+        else:
+            optimized.append(action)
+
+    return optimized
+
+
+class ChainRecorder:
+
+    def __init__(
+        self,
+        executor: ChainExecutor,
+        filename_prefix: str = "/recorded",
+        max_wait: float = 3,
+    ) -> None:
+        self.executor = executor
+        self.filename_prefix = filename_prefix
+        self.max_wait = max_wait
+        self.actions: list[AnyAction] = []
+        self.last_recorded_at: Optional[float] = None
+        # Bindings and page events are handled in separate tasks.
+        # The lock keeps them in the order they were fired in the browser.
+        self.lock = asyncio.Lock()
+        self.stopped = asyncio.Event()
+
+    async def record(self, name: str, url: str) -> Chain:
+        self.executor.running_chain = name
+        await self.executor.authenticate()
+
+        context = self.executor.context
+        await context.expose_binding("__screenshotsPipelineRecord", self._on_record)
+        await context.add_init_script(RECORDER_SCRIPT)
+        context.on("page", self._on_page)
+        self.executor.page.on("close", self._on_page_close)
+
+        print(f"{name} | Navigating to: {url}.")
+        await self.executor.page.goto(self.executor.base_url + url)
+        print(
+            f"{name} | Recording. Alt+Shift+S: screenshot of hovered element, "
+            "Alt+Shift+P: full page screenshot, Alt+Shift+Q or closing the browser: stop."
+        )
+        await self.stopped.wait()
+
+        async with self.lock:
+            actions = optimize_actions(self.actions)
+
+        return Chain.model_validate(
+            {
+                "name": name,
+                "url": url,
+                "actions": [action.model_dump(mode="json") for action in actions],
+            }
+        )
+
+    async def _on_page(self, page: Page) -> None:
+        async with self.lock:
+            if self.actions:
+                self.actions[-1] = self.actions[-1].model_copy(
+                    update={"new_page_handling_required": True}
+                )
+
+            print(f"{self.executor.running_chain} | Switching to the new page.")
+            self.executor.page = page
+            page.on("close", self._on_page_close)
+
+    def _on_page_close(self, page: Page) -> None:
+        if not page.context.pages:
+            self.stopped.set()
+
+    async def _on_record(self, source: dict, payload: dict) -> None:
+        async with self.lock:
+            if payload["type"] == "stop":
+                self.stopped.set()
+                return
+
+            self._record_wait(payload["time"] / 1000)
+            selectors = (
+                [await self._pick_selector(source["page"], payload)]
+                if payload["fallback"]
+                else []
+            )
+            self._add_action(payload, selectors)
+
+    def _record_wait(self, recorded_at: float) -> None:
+        if self.actions and self.last_recorded_at is not None:
+            self.actions[-1] = self.actions[-1].model_copy(
+                update={
+                    "post_action_timeout": round(
+                        min(self.max_wait, max(0, recorded_at - self.last_recorded_at)),
+                        1,
+                    )
+                }
+            )
+        self.last_recorded_at = recorded_at
+
+    def _add_action(self, payload: dict, selectors: list[AnyElementSelector]) -> None:
+        if payload["type"] == ActionType.screenshot:
+            filename = (
+                f"{self.filename_prefix}/"
+                f"{sum(isinstance(a, ScreenshotAction) for a in self.actions) + 1:03d}.png"
+            )
+            action = ScreenshotAction(
+                type=ActionType.screenshot,
+                element_selector=selectors,
+                filename=filename,
+                note=filename,
+            )
+        else:
+            action = Action(
+                type=payload["type"],
+                element_selector=selectors,
+                action_kwargs={"value": payload["value"]} if "value" in payload else {},
+            )
+
+        self.actions.append(action)
+        print(
+            f"{self.executor.running_chain} | Recorded {action.type}: "
+            f"{json.dumps([s.model_dump(mode='json') for s in selectors])}."
+        )
+
+    async def _pick_selector(self, page: Page, payload: dict) -> AnyElementSelector:
+        fallback = LocatorElementSelector(
+            type=SelectorType.locator, expression=payload["fallback"]
+        )
+
+        element = page.locator(f'[{TARGET_ATTRIBUTE}="{payload["target"]}"]')
+        try:
+            element_exists = await element.count() == 1
+        except PlaywrightError:
+            element_exists = False
+
+        if element_exists:
+            suggestions = await SelectorProfiler.suggest_alternatives(
+                page, fallback, element
+            )
+            if suggestions:
+                return SelectorProfiler.build_selector(suggestions[0]["selector"])
+
+        if payload["candidates"]:
+            print(
+                f"{self.executor.running_chain} | Element is gone, using selector "
+                "found unique at event time."
+            )
+            return SelectorProfiler.build_selector(payload["candidates"][0])
+
+        print(
+            f"{self.executor.running_chain} | No unique selector was found, "
+            "falling back to XPath."
+        )
+        return fallback
+
+
+class ReplayCheckpoints:
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.checkpoints: list[dict] = []
+
+        if os.path.exists(path):
+            with open(path) as file:
+                self.checkpoints = json.load(file)
+
+    def save(self) -> None:
+        with open(self.path, "w") as file:
+            json.dump(self.checkpoints, file)
+
+    @staticmethod
+    def get_digest(chain: Chain, actions_count: int) -> str:
+        prefix = {
+            "url": chain.url,
+            "actions": [
+                action.model_dump(mode="json")
+                for action in chain.actions[:actions_count]
+            ],
+        }
+        return hashlib.sha256(json.dumps(prefix, sort_keys=True).encode()).hexdigest()
+
+    def find_latest(self, chain: Chain) -> Optional[dict]:
+        for checkpoint in sorted(
+            self.checkpoints, key=lambda item: item["actions_count"], reverse=True
+        ):
+            if checkpoint["digest"] == self.get_digest(
+                chain, checkpoint["actions_count"]
+            ):
+                return checkpoint
+
+        return None
+
+    def add(self, chain: Chain, actions_count: int, url: str, storage_state: dict):
+        self.checkpoints = [
+            checkpoint
+            for checkpoint in self.checkpoints
+            if checkpoint["actions_count"] < actions_count
+        ]
+        self.checkpoints.append(
+            {
+                "actions_count": actions_count,
+                "digest": self.get_digest(chain, actions_count),
+                "url": url,
+                "storage_state": storage_state,
+            }
+        )
+
+
+async def replay_chain(
+    executor: ChainExecutor,
+    chain: Chain,
+    checkpoints: ReplayCheckpoints,
+    full: bool = False,
+) -> None:
+    executor.running_chain = chain.name
+    # Digests are computed from a copy taken before execution,
+    # so they are not affected by anything that happens while replaying.
+    pristine_chain = chain.model_copy(deep=True)
+    checkpoint = None if full else checkpoints.find_latest(pristine_chain)
+
+    if checkpoint:
+        print(
+            f"{chain.name} | Restoring state after action "
+            f"{checkpoint['actions_count']}/{len(chain.actions)}: {checkpoint['url']}."
+        )
+        await executor.initialize({"storage_state": checkpoint["storage_state"]})
+        await executor.page.goto(checkpoint["url"])
+        start_index = checkpoint["actions_count"]
+    else:
+        await executor.authenticate()
+        print(f"{chain.name} | Navigating to: {chain.url}.")
+        await executor.page.goto(executor.base_url + chain.url)
+        start_index = 0
+
+    await executor.page.wait_for_load_state()
+
+    for index in range(start_index, len(chain.actions)):
+        action = chain.actions[index]
+        try:
+            await executor.handle_action(action)
+        except Exception as e:
+            raise type(e)(str(e) + f"| Action #{index} note: {action.note}. |")
+
+        checkpoints.add(
+            pristine_chain,
+            index + 1,
+            executor.page.url,
+            await executor.context.storage_state(),
+        )
+        checkpoints.save()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Record chains in the browser and replay their edited tails."
+    )
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    record_parser = modes.add_parser("record", help="Record a new chain.")
+    record_parser.add_argument("url", help="URL of page to start recording at.")
+    record_parser.add_argument("--name", default="Recorded chain")
+    record_parser.add_argument("--output", default="../recorded-chain.json")
+    record_parser.add_argument("--filename-prefix", default="/recorded")
+    record_parser.add_argument(
+        "--max-wait",
+        type=float,
+        default=3,
+        help="Upper bound in seconds for waits recorded between actions.",
+    )
+
+    replay_parser = modes.add_parser(
+        "replay",
+        help="Replay a chain starting from the latest saved state "
+        "whose preceding actions were not edited.",
+    )
+    replay_parser.add_argument("chain_path")
+    replay_parser.add_argument(
+        "--full", action="store_true", help="Replay the whole chain."
+    )
+
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    executor = ChainExecutor(Config.model_validate(config_dict))
+
+    try:
+        if args.mode == "record":
+            recorder = ChainRecorder(executor, args.filename_prefix, args.max_wait)
+            chain = await recorder.record(args.name, args.url)
+            with open(args.output, "w") as file:
+                json.dump(
+                    chain.model_dump(mode="json", exclude_defaults=True),
+                    file,
+                    indent=4,
+                )
+            print(
+                f"{chain.name} | Recorded {len(chain.actions)} actions: {args.output}."
+            )
+        else:
+            with open(args.chain_path) as file:
+                chain = Chain.model_validate_json(file.read())
+            checkpoints = ReplayCheckpoints(args.chain_path + ".checkpoints.json")
+            await replay_chain(executor, chain, checkpoints, args.full)
+            print(f"{chain.name} | Replay completed.")
+    finally:
+        await executor.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
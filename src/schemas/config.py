@@ -1,6 +1,7 @@
-from typing import Optional
+from enum import StrEnum
+from typing import Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class AuthConfig(BaseModel):
@@ -24,6 +25,181 @@ class AuthConfig(BaseModel):
     )
 
 
+class MetricsConfig(BaseModel):
+    host: str = Field("127.0.0.1", description="Host to bind the metrics endpoint to.")
+    port: Optional[int] = Field(
+        None,
+        description="Port to serve Prometheus-style metrics at '/metrics'. "
+        "Endpoint is disabled if not set.",
+        ge=0,
+    )
+    progress_interval: float = Field(
+        5,
+        description="Interval in seconds between terminal progress reports. "
+        "Set to 0 to disable progress reporting.",
+        ge=0,
+    )
+
+
+class ProfilerConfig(BaseModel):
+    profile_path: str = Field(
+        "../selector_profile.json",
+        description="Path to JSON file to accumulate selector statistics across runs.",
+    )
+    slow_threshold: float = Field(
+        1,
+        description="Average resolution time in seconds to flag selector as slow.",
+        ge=0,
+    )
+    suggest_alternatives: bool = Field(
+        True,
+        description="Whether or not to inspect DOM of found elements to suggest "
+        "faster and more stable selectors for slow and fragile ones.",
+    )
+
+
+class FailureArtifactsConfig(BaseModel):
+    output_dir: str = Field(
+        "../failure-artifacts",
+        description="Base directory to dump artifacts of failed actions to.",
+    )
+    buffer_size: int = Field(
+        50,
+        description="Number of recent actions, console messages and network events "
+        "per page to keep in memory for the failure report.",
+        ge=1,
+    )
+    trace: bool = Field(
+        False,
+        description="Whether or not to record Playwright trace of the failed action. "
+        "Trace is recorded per action and is dropped if the action succeeds, "
+        "but recording it slows down every action, "
+        "especially with screenshots or snapshots enabled.",
+    )
+    trace_screenshots: bool = Field(
+        False, description="Whether or not to capture screenshots in trace."
+    )
+    trace_snapshots: bool = Field(
+        True, description="Whether or not to capture DOM snapshots in trace."
+    )
+
+
+class ConcurrencyConfig(BaseModel):
+    initial_workers: int = Field(
+        2, description="Number of chains to execute concurrently at start.", ge=1
+    )
+    min_workers: int = Field(1, ge=1)
+    max_workers: int = Field(8, ge=1)
+    adjustment_interval: float = Field(
+        10, description="Interval in seconds between limit adjustments.", gt=0
+    )
+    decrease_factor: float = Field(
+        0.5,
+        description="Factor to multiply workers limit by on congestion.",
+        gt=0,
+        lt=1,
+    )
+    target_action_latency: float = Field(
+        5,
+        description="Average action duration in seconds above which "
+        "target app is considered congested.",
+        gt=0,
+    )
+    max_timeout_rate: float = Field(
+        0.1,
+        description="Share of timed out actions above which "
+        "target app is considered congested.",
+        ge=0,
+        le=1,
+    )
+    max_cpu_load: float = Field(
+        0.9,
+        description="1-minute load average per CPU above which host is considered busy.",
+        gt=0,
+    )
+    min_available_memory: float = Field(
+        0.15,
+        description="Share of available memory below which host is considered busy.",
+        ge=0,
+        le=1,
+    )
+
+    @model_validator(mode="after")
+    def check_workers_bounds_consistency(self):
+        if not self.min_workers <= self.initial_workers <= self.max_workers:
+            raise ValueError(
+                "'initial_workers' must be between 'min_workers' and 'max_workers'."
+            )
+
+        return self
+
+
+class OutputBackendType(StrEnum):
+    local = "local"
+    s3 = "s3"
+    bundle = "bundle"
+
+
+class OutputBackendConfig(BaseModel):
+    type: OutputBackendType
+    workers: int = Field(4, description="Number of concurrent writers/uploaders.", ge=1)
+    queue_size: int = Field(
+        64,
+        description="Number of output files to keep in memory while waiting "
+        "to be written. Capturing of further screenshots waits when it's full.",
+        ge=1,
+    )
+    retries: int = Field(
+        2,
+        description="Number of retries for output file that failed to be written. "
+        "Ignored by bundle backend, as tarball can't be appended to partially.",
+        ge=0,
+    )
+
+
+class LocalOutputConfig(OutputBackendConfig):
+    type: Literal[OutputBackendType.local]
+
+
+class S3OutputConfig(OutputBackendConfig):
+    type: Literal[OutputBackendType.s3]
+    bucket: str
+    prefix: str = Field("", description="Key prefix to prepend to output file paths.")
+    endpoint_url: Optional[str] = Field(
+        None,
+        description="Endpoint URL of S3-compatible storage (e.g. MinIO). "
+        "AWS S3 is used if not set.",
+    )
+    region: Optional[str] = None
+    access_key_id: Optional[str] = Field(
+        None, description="Access key ID. Default credentials chain is used if not set."
+    )
+    secret_access_key: Optional[str] = None
+    multipart_threshold: int = Field(
+        8 * 1024 * 1024,
+        description="Size in bytes starting from which files are uploaded in parts.",
+        ge=5 * 1024 * 1024,
+    )
+    multipart_chunksize: int = Field(
+        8 * 1024 * 1024,
+        description="Size in bytes of each part of multipart upload.",
+        ge=5 * 1024 * 1024,
+    )
+
+
+class BundleOutputConfig(OutputBackendConfig):
+    type: Literal[OutputBackendType.bundle]
+    path: str = Field(
+        "../documentation-screenshots.tar.gz",
+        description="Path to tarball to write output files into.",
+    )
+    root_dir: str = Field(
+        "documentation-screenshots",
+        description="Directory inside tarball to put output files into.",
+    )
+    compress: bool = Field(True, description="Whether or not to gzip tarball.")
+
+
 class Config(BaseModel):
     base_output_dir: str = Field(
         "",
@@ -33,3 +209,19 @@ class Config(BaseModel):
         "", description="Base URL for authentication and action operations."
     )
     auth_config: Optional[AuthConfig] = None
+    metrics_config: Optional[MetricsConfig] = None
+    profiler_config: Optional[ProfilerConfig] = None
+    failure_artifacts_config: Optional[FailureArtifactsConfig] = None
+    concurrency_config: Optional[ConcurrencyConfig] = Field(
+        None,
+        description="Adaptive limit of concurrently executed chains. "
+        "All chains are executed at once if not set.",
+    )
+    output_backend_config: Optional[
+        LocalOutputConfig | S3OutputConfig | BundleOutputConfig
+    ] = Field(
+        None,
+        discriminator="type",
+        description="Backend to write output files to. "
+        "Files are written into 'base_output_dir' if not set.",
+    )
@@ -1,13 +1,11 @@
-from enum import StrEnum
-from typing import Any, List
+import csv
+import re
+from enum import Enum, StrEnum
+from typing import Annotated, Any, Iterator, List, Literal, Optional
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
-from schemas.selectors import (
-    ComplexElementSelector,
-    LocatorElementSelector,
-    TextElementSelector,
-)
+from schemas.selectors import AnyElementSelector
 
 
 class ActionType(StrEnum):
@@ -24,10 +22,18 @@ class ActionType(StrEnum):
 
 
 class Action(BaseModel):
-    type: ActionType
-    element_selector: List[
-        TextElementSelector | LocatorElementSelector | ComplexElementSelector
-    ] = Field(
+    type: Literal[
+        ActionType.click,
+        ActionType.dblclick,
+        ActionType.hover,
+        ActionType.fill,
+        ActionType.check,
+        ActionType.select_option,
+        ActionType.set_input_files,
+        ActionType.focus,
+        ActionType.drag_to,
+    ]
+    element_selector: List[AnyElementSelector] = Field(
         default_factory=list,
         description="Selector to get element access to apply action. "
         "For all actions it's a one-element list. "
@@ -81,15 +87,197 @@ class Action(BaseModel):
 
 
 class ScreenshotAction(Action):
+    type: Literal[ActionType.screenshot]
     filename: str = Field(description="Path to file to store screenshot.")
     padding: int = Field(20, ge=0)
+    stabilize: bool = Field(
+        False,
+        description="Whether or not to disable animations, transitions and "
+        "text caret, and to wait for web fonts to load before taking screenshot.",
+    )
+    mask_selectors: List[AnyElementSelector] = Field(
+        default_factory=list,
+        description="Selectors of dynamic regions (timestamps, avatars, etc.) "
+        "to be masked on the screenshot.",
+    )
+    stable_captures: int = Field(
+        1,
+        description="Number of consecutive identical captures required to accept "
+        "screenshot. '1' means that the first capture is accepted.",
+        ge=1,
+    )
+    stabilization_timeout: float = Field(
+        5,
+        description="Time in seconds to wait for identical captures before giving up.",
+        ge=0,
+    )
+
+    @model_validator(mode="after")
+    def check_stable_captures_and_new_page_handling_consistency(self):
+        if self.stable_captures > 1 and self.new_page_handling_required:
+            raise ValueError(
+                "New page handling is not supported for screenshot "
+                "with more than one stable capture."
+            )
+
+        return self
+
+
+AnyAction = Annotated[Action | ScreenshotAction, Field(discriminator="type")]
 
 
 class Chain(BaseModel):
     name: str = Field("N/D", description="Name of chain to display at logs.")
     url: str = Field(..., description="URL of page to start performing actions at.")
-    actions: List[Action | ScreenshotAction] = Field(default_factory=list)
+    actions: List[AnyAction] = Field(default_factory=list)
+
+
+PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)\}")
+
+
+def find_placeholders(value: Any) -> set[str]:
+    if isinstance(value, str):
+        return set(PLACEHOLDER_PATTERN.findall(value))
+    if isinstance(value, BaseModel):
+        value = [getattr(value, field) for field in type(value).model_fields]
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        return set().union(*[find_placeholders(item) for item in value])
+
+    return set()
+
+
+def substitute_placeholders(value: Any, parameters: dict[str, str | int]) -> Any:
+    if isinstance(value, Enum):
+        return value
+    if isinstance(value, str):
+        return PLACEHOLDER_PATTERN.sub(
+            lambda match: str(parameters.get(match.group(1), match.group(0))), value
+        )
+    if isinstance(value, BaseModel):
+        return value.model_copy(
+            update={
+                field: substitute_placeholders(getattr(value, field), parameters)
+                for field in type(value).model_fields
+            }
+        )
+    if isinstance(value, dict):
+        return {
+            key: substitute_placeholders(item, parameters)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [substitute_placeholders(item, parameters) for item in value]
+
+    return value
+
+
+class ChainTemplate(Chain):
+    parameters: List[dict[str, str | int]] = Field(
+        default_factory=list,
+        description="Parameter table to expand chain over. Each row produces a chain "
+        "with '{parameter}' placeholders in its strings replaced by row values.",
+    )
+    parameters_csv: Optional[str] = Field(
+        None,
+        description="Path to CSV file with header row to read parameter table from. "
+        "File is read lazily, at chains scheduling time.",
+    )
+    _variants_count: Optional[int] = PrivateAttr(None)
+
+    @model_validator(mode="after")
+    def check_parameters_consistency(self):
+        if bool(self.parameters) == bool(self.parameters_csv):
+            raise ValueError(
+                "Exactly one of 'parameters' and 'parameters_csv' is required."
+            )
+
+        placeholders = self.get_placeholders()
+        if not placeholders:
+            raise ValueError(
+                "Chain template must contain placeholders, "
+                "otherwise all its variants are the same chain."
+            )
+
+        for row in self.parameters:
+            self.check_parameters_row(row, placeholders, f"Parameters row {row}")
+
+        for action in self.actions:
+            if isinstance(action, ScreenshotAction) and not find_placeholders(
+                action.filename
+            ):
+                raise ValueError(
+                    f"Screenshot filename '{action.filename}' must contain "
+                    "placeholders, otherwise chain variants override it."
+                )
+
+        return self
+
+    def get_placeholders(self) -> set[str]:
+        return find_placeholders([self.name, self.url, self.actions])
+
+    @staticmethod
+    def check_parameters_row(
+        row: dict[str, str | int], placeholders: set[str], row_description: str
+    ) -> None:
+        if missing := {
+            placeholder
+            for placeholder in placeholders
+            if row.get(placeholder) in (None, "")
+        }:
+            raise ValueError(f"{row_description} misses {sorted(missing)} values.")
+
+    def iter_parameters(self) -> Iterator[dict[str, str | int]]:
+        if not self.parameters_csv:
+            yield from self.parameters
+            return
+
+        placeholders = self.get_placeholders()
+        with open(self.parameters_csv, newline="") as file:
+            reader = csv.DictReader(file)
+            if missing := placeholders - set(reader.fieldnames or []):
+                raise ValueError(
+                    f"'{self.parameters_csv}' misses {sorted(missing)} columns."
+                )
+            for row in reader:
+                self.check_parameters_row(
+                    row,
+                    placeholders,
+                    f"'{self.parameters_csv}' line {reader.line_num}",
+                )
+                yield row
+
+    def count_variants(self) -> int:
+        if self._variants_count is None:
+            self._variants_count = sum(1 for _ in self.iter_parameters())
+
+        return self._variants_count
+
+    def expand(self) -> Iterator[Chain]:
+        template = Chain.model_construct(
+            name=self.name, url=self.url, actions=self.actions
+        )
+        for parameters in self.iter_parameters():
+            yield substitute_placeholders(template, parameters)
 
 
 class Flow(BaseModel):
     chains: List[Chain] = Field(default_factory=list)
+    chain_templates: List[ChainTemplate] = Field(default_factory=list)
+
+    def iter_chains(self) -> Iterator[Chain]:
+        yield from self.chains
+        for chain_template in self.chain_templates:
+            yield from chain_template.expand()
+
+    def count_chains(self) -> int:
+        return len(self.chains) + sum(
+            chain_template.count_variants() for chain_template in self.chain_templates
+        )
+
+    def count_actions(self) -> int:
+        return sum(len(chain.actions) for chain in self.chains) + sum(
+            len(chain_template.actions) * chain_template.count_variants()
+            for chain_template in self.chain_templates
+        )
@@ -1,4 +1,5 @@
 from enum import StrEnum
+from typing import Annotated, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -7,6 +8,7 @@ class SelectorType(StrEnum):
     text = "text"
     locator = "locator"
     complex = "complex"
+    role = "role"
 
 
 class MatchMode(StrEnum):
@@ -19,11 +21,13 @@ class ElementSelector(BaseModel):
 
 
 class TextElementSelector(ElementSelector):
+    type: Literal[SelectorType.text]
     text: str
     match: MatchMode = MatchMode.exact
 
 
 class LocatorElementSelector(ElementSelector):
+    type: Literal[SelectorType.locator]
     expression: str = Field(
         ...,
         description="Selector (XPath expression) to pass it into the Playwright 'page.locator' function.",
@@ -31,5 +35,25 @@ class LocatorElementSelector(ElementSelector):
 
 
 class ComplexElementSelector(ElementSelector):
+    type: Literal[SelectorType.complex]
     text_selector: TextElementSelector
     locator_selector: LocatorElementSelector
+
+
+class RoleElementSelector(ElementSelector):
+    type: Literal[SelectorType.role]
+    role: str = Field(
+        ...,
+        description="ARIA role to pass it into the Playwright 'page.get_by_role' function.",
+    )
+    name: Optional[str] = Field(None, description="Accessible name of element.")
+    match: MatchMode = MatchMode.exact
+
+
+AnyElementSelector = Annotated[
+    TextElementSelector
+    | LocatorElementSelector
+    | ComplexElementSelector
+    | RoleElementSelector,
+    Field(discriminator="type"),
+]
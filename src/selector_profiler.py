@@ -0,0 +1,289 @@
+import json
+import os
+import re
+import time
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import Locator, Page
+
+from schemas.config import ProfilerConfig
+from schemas.selectors import (
+    AnyElementSelector,
+    ElementSelector,
+    LocatorElementSelector,
+    MatchMode,
+    RoleElementSelector,
+    SelectorType,
+    TextElementSelector,
+)
+
+HASHED_CLASS_PATTERN = re.compile(r"_[a-z0-9]{5}_\d+\b")
+ABSOLUTE_XPATH_PATTERN = re.compile(r"^(xpath=)?/html/")
+MAX_CHAINS_PER_SELECTOR = 10
+
+CANDIDATES_SCRIPT = """
+element => {
+    const candidates = [];
+    const tag = element.tagName.toLowerCase();
+    const quote = value => JSON.stringify(value);
+
+    for (const attribute of ["data-testid", "data-test-id", "data-test", "data-qa"]) {
+        const value = element.getAttribute(attribute);
+        if (value) {
+            candidates.push({type: "locator", expression: `[${attribute}=${quote(value)}]`});
+        }
+    }
+
+    const implicitRoles = {
+        a: element.hasAttribute("href") ? "link" : null,
+        button: "button",
+        h1: "heading", h2: "heading", h3: "heading",
+        h4: "heading", h5: "heading", h6: "heading",
+        input: ["checkbox", "radio"].includes(element.type) ? element.type : "textbox",
+        select: "combobox",
+        textarea: "textbox",
+        dialog: "dialog",
+    };
+    const role = element.getAttribute("role") || implicitRoles[tag];
+    const text = (element.innerText || "").trim();
+    const name = element.getAttribute("aria-label") || (text.length <= 50 ? text : "");
+    if (role && name) {
+        candidates.push({type: "role", role: role, name: name});
+    }
+
+    if (element.id && !/\\d{3,}/.test(element.id)) {
+        candidates.push({type: "locator", expression: `#${CSS.escape(element.id)}`});
+    }
+
+    for (const attribute of ["aria-label", "data-writer-tooltip", "title", "name", "placeholder"]) {
+        const value = element.getAttribute(attribute);
+        if (value) {
+            candidates.push({type: "locator", expression: `${tag}[${attribute}=${quote(value)}]`});
+        }
+    }
+
+    const stableClasses = Array.from(element.classList).filter(
+        name => !/_[a-z0-9]{5}_\\d+$/.test(name) && !/\\d{3,}/.test(name)
+    );
+    if (stableClasses.length) {
+        candidates.push({
+            type: "locator",
+            expression: tag + stableClasses.map(name => `.${CSS.escape(name)}`).join(""),
+        });
+    }
+
+    if (text && text.length <= 50 && !text.includes("\\n")) {
+        candidates.push({type: "text", text: text});
+    }
+
+    return candidates;
+}
+"""
+
+
+class SelectorProfiler:
+
+    def __init__(self, config: ProfilerConfig) -> None:
+        self.config = config
+        self.profile = self._load_profile()
+        self.suggested_in_this_run: set[str] = set()
+
+    def _load_profile(self) -> dict:
+        if os.path.exists(self.config.profile_path):
+            with open(self.config.profile_path) as file:
+                return json.load(file)
+
+        return {"selectors": {}}
+
+    def save(self) -> None:
+        with open(self.config.profile_path, "w") as file:
+            json.dump(self.profile, file, indent=2)
+
+    @staticmethod
+    def selector_key(selector: ElementSelector) -> str:
+        return json.dumps(selector.model_dump(mode="json"), sort_keys=True)
+
+    async def record(
+        self,
+        page: Page,
+        selector: AnyElementSelector,
+        element: Locator,
+        resolution_time: float,
+        found: bool,
+        chain_name: str = "N/D",
+    ) -> None:
+        key = self.selector_key(selector)
+        entry = self.profile["selectors"].setdefault(
+            key,
+            {
+                "selector": selector.model_dump(mode="json"),
+                "samples": 0,
+                "failures": 0,
+                "total_time": 0.0,
+                "max_time": 0.0,
+                "match_counts": {},
+                "chains": [],
+                "suggestions": [],
+            },
+        )
+
+        # Found element is already verified to be the only match.
+        match_count = 1
+        if not found:
+            try:
+                match_count = await element.count()
+            except PlaywrightError:
+                match_count = 0
+
+        entry["samples"] += 1
+        entry["failures"] += 0 if found else 1
+        entry["total_time"] += resolution_time
+        entry["max_time"] = max(entry["max_time"], resolution_time)
+        entry["match_counts"][str(match_count)] = (
+            entry["match_counts"].get(str(match_count), 0) + 1
+        )
+        if (
+            chain_name not in entry["chains"]
+            and len(entry["chains"]) < MAX_CHAINS_PER_SELECTOR
+        ):
+            entry["chains"].append(chain_name)
+
+        if (
+            found
+            and self.config.suggest_alternatives
+            and key not in self.suggested_in_this_run
+            and self._needs_alternative(selector, entry)
+        ):
+            self.suggested_in_this_run.add(key)
+            entry["suggestions"] = await self.suggest_alternatives(
+                page, selector, element
+            )
+
+    def _needs_alternative(self, selector: ElementSelector, entry: dict) -> bool:
+        if entry["total_time"] / entry["samples"] > self.config.slow_threshold:
+            return True
+
+        if selector.type == SelectorType.complex:
+            return True
+
+        expression = getattr(selector, "expression", "")
+        return bool(
+            ABSOLUTE_XPATH_PATTERN.match(expression)
+            or HASHED_CLASS_PATTERN.search(expression)
+        )
+
+    @staticmethod
+    async def suggest_alternatives(
+        page: Page, selector: ElementSelector, element: Locator
+    ) -> list[dict]:
+        try:
+            candidates = await element.evaluate(CANDIDATES_SCRIPT)
+            element_handle = await element.element_handle()
+        except PlaywrightError:
+            return []
+
+        original = selector.model_dump(mode="json")
+        suggestions = []
+        for candidate in candidates:
+            candidate_selector = SelectorProfiler.build_selector(candidate)
+            if candidate_selector.model_dump(mode="json") == original:
+                continue
+
+            started_at = time.monotonic()
+            try:
+                locator = SelectorProfiler._build_locator(page, candidate_selector)
+                if await locator.count() != 1:
+                    continue
+                if not await locator.evaluate(
+                    "(candidate, element) => candidate === element",
+                    element_handle,
+                ):
+                    continue
+            except PlaywrightError:
+                continue
+
+            suggestions.append(
+                {
+                    "selector": candidate_selector.model_dump(mode="json"),
+                    "resolution_time": time.monotonic() - started_at,
+                }
+            )
+
+        return sorted(suggestions, key=lambda suggestion: suggestion["resolution_time"])
+
+    @staticmethod
+    def build_selector(
+        candidate: dict,
+    ) -> TextElementSelector | LocatorElementSelector | RoleElementSelector:
+        match candidate["type"]:
+
+            case SelectorType.text:
+                return TextElementSelector.model_validate(candidate)
+
+            case SelectorType.locator:
+                return LocatorElementSelector.model_validate(candidate)
+
+            case SelectorType.role:
+                return RoleElementSelector.model_validate(candidate)
+
+            case _:
+                raise ValueError("Invalid selector type.")
+
+    @staticmethod
+    def _build_locator(
+        page: Page,
+        selector: TextElementSelector | LocatorElementSelector | RoleElementSelector,
+    ) -> Locator:
+        match selector.type:
+
+            case SelectorType.text:
+                return page.get_by_text(
+                    selector.text, exact=selector.match == MatchMode.exact
+                )
+
+            case SelectorType.locator:
+                return page.locator(selector.expression)
+
+            case SelectorType.role:
+                return page.get_by_role(
+                    selector.role,
+                    name=selector.name,
+                    exact=selector.match == MatchMode.exact,
+                )
+
+            case _:
+                raise ValueError("Invalid selector type.")
+
+    def flagged_selectors(self) -> list[tuple[str, dict]]:
+        flagged = []
+        for entry in self.profile["selectors"].values():
+            reasons = []
+            average_time = entry["total_time"] / entry["samples"]
+            if average_time > self.config.slow_threshold:
+                reasons.append(f"slow ({average_time:.2f}s avg)")
+            if any(int(count) > 1 for count in entry["match_counts"]):
+                reasons.append(f"ambiguous (match counts {entry['match_counts']})")
+            if entry["failures"]:
+                reasons.append(f"failed {entry['failures']}/{entry['samples']}")
+            if reasons or entry["suggestions"]:
+                flagged.append((", ".join(reasons) or "fragile", entry))
+
+        return sorted(
+            flagged,
+            key=lambda item: item[1]["total_time"] / item[1]["samples"],
+            reverse=True,
+        )
+
+    def report(self) -> None:
+        for reasons, entry in self.flagged_selectors():
+            print(
+                f"Selector profiler | {reasons}: {json.dumps(entry['selector'])}. "
+                f"Used by: {', '.join(entry['chains'])}"
+                f"{', ...' if len(entry['chains']) >= MAX_CHAINS_PER_SELECTOR else ''}."
+            )
+            for suggestion in entry["suggestions"][:3]:
+                print(
+                    f"Selector profiler |     suggestion "
+                    f"({suggestion['resolution_time'] * 1000:.0f}ms): "
+                    f"{json.dumps(suggestion['selector'])}"
+                )